@@ -9,16 +9,31 @@ ESP32 GCS - Single File GUI
 - Simple FPS/OSD and log screen
 """
 
-import os, time, threading, queue
+import os, sys, time, socket, threading, queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urljoin
 
 import cv2
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from PIL import Image, ImageTk
 import tkinter as tk
 
+try:  # optional: libjpeg-turbo SIMD decoder, about 2x faster than cv2.imdecode
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    TJ = TurboJPEG()
+except Exception:  # not installed, or libjpeg-turbo shared library missing
+    TJ = None
+
+try:  # optional: compiles the MJPEG marker scan to native code
+    from numba import njit
+except ImportError:
+    njit = None
+
 # ---------- USER SETTINGS ----------
 BASE_HOST  = "http://192.168.4.1"            # for control/capture
 STREAM_URL = "http://192.168.4.1:81/stream"  # MJPEG stream (tries 80 if necessary)
@@ -28,10 +43,32 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 def now_ts(): return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 # ---------- HTTP helpers ----------
+class TunedAdapter(HTTPAdapter):
+    """Sockets get a large receive buffer (one recv can take most of a JPEG frame) on top of
+    urllib3's defaults (TCP_NODELAY). Set before connect so the TCP window can scale to it."""
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)]
+        super().init_poolmanager(*args, **kwargs)
+
+# single keep-alive session: every request reuses the open socket instead of a new TCP handshake.
+# Control calls run on the GUI thread, so only failed connects are retried (not slow reads).
+SESSION = requests.Session()
+_adapter = TunedAdapter(pool_connections=4, pool_maxsize=8,
+                        max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# the MJPEG stream never retries: the worker moves on to the next candidate URL instead
+STREAM_SESSION = requests.Session()
+_stream_adapter = TunedAdapter(max_retries=0)
+STREAM_SESSION.mount("http://", _stream_adapter)
+STREAM_SESSION.mount("https://", _stream_adapter)
+
 def http_get(path, timeout=(5, 10)):
     try:
         url = urljoin(BASE_HOST + "/", path.lstrip("/"))
-        return requests.get(url, timeout=timeout)
+        return SESSION.get(url, timeout=timeout)
     except Exception:
         return None
 
@@ -39,11 +76,111 @@ def set_quality(v:int):         return http_get(f"/control?var=quality&val={v}")
 def set_framesize(code:int):    return http_get(f"/control?var=framesize&val={code}")
 def capture_jpg(timeout=(5,10)):
     try:
-        r = requests.get(urljoin(BASE_HOST + "/", "capture"), timeout=timeout)
+        r = SESSION.get(urljoin(BASE_HOST + "/", "capture"), timeout=timeout)
         r.raise_for_status(); return r.content
     except Exception:
         return None
 
+# ---------- JPEG decode ----------
+def decode_jpg(jpg):
+    """JPEG bytes (or a uint8 array view) -> BGR ndarray, None if it could not be decoded."""
+    if TJ is not None:
+        try: return TJ.decode(jpg, pixel_format=TJPF_BGR)
+        except Exception: pass
+    return cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), 1)
+
+# ---------- Frame ring ----------
+class FrameRing:
+    """Fixed-size ring of frame slots between the stream workers and the GUI.
+    When full the oldest frame is overwritten, so the GUI never waits on stale frames.
+    The GUI side (get_nowait) takes no lock; put only locks against other producers
+    (the decode pool can finish two frames at once). Relies on the GIL for slot access."""
+    def __init__(self, size=4):
+        assert size & (size - 1) == 0, "size must be a power of 2"
+        self.slots = [None] * size
+        self.mask = size - 1
+        self.head = 0   # frames written so far, owned by producers
+        self.tail = 0   # frames read so far, owned by the consumer
+        self._put_lock = threading.Lock()
+
+    def put(self, frame):
+        with self._put_lock:
+            self.slots[self.head & self.mask] = frame
+            self.head += 1
+
+    def get_nowait(self):
+        head = self.head
+        if self.tail >= head:
+            raise queue.Empty
+        if head - self.tail > len(self.slots):
+            self.tail = head - len(self.slots)  # skip what was overwritten
+        frame = self.slots[self.tail & self.mask]
+        self.tail += 1
+        return frame
+
+    def full(self):
+        return self.head - self.tail >= len(self.slots)
+
+    def pending(self):
+        return self.head != self.tail
+
+# ---------- MJPEG demux ----------
+MJPEG_BUF_SIZE  = 256 * 1024  # must hold at least one whole JPEG frame
+MJPEG_READ_SIZE = 64 * 1024   # max bytes per socket read
+
+def find_marker(arr, second, start, end):
+    """Index of the first 0xFF,second pair in arr[start:end], or -1."""
+    seg = arr[start:end]
+    hits = np.flatnonzero((seg[:-1] == 0xFF) & (seg[1:] == second))
+    return start + int(hits[0]) if hits.size else -1
+
+def _find_marker_loop(arr, second, start, end):
+    # same search as a plain loop: stops at the first hit, no temporary arrays
+    for i in range(start, end - 1):
+        if arr[i] == 0xFF and arr[i + 1] == second:
+            return i
+    return -1
+
+if njit is not None:  # compiled, runs without the GIL
+    find_marker = njit(nogil=True, cache=True)(_find_marker_loop)
+
+class MjpegBuffer:
+    """Fixed-size byte buffer that cuts JPEG frames (SOI..EOI) out of an MJPEG byte stream.
+    Scanning resumes where the previous chunk stopped, so every byte is looked at once."""
+    def __init__(self, size=MJPEG_BUF_SIZE):
+        self.buf = bytearray(size)
+        self.mv = memoryview(self.buf)
+        self.arr = np.frombuffer(self.buf, dtype=np.uint8)  # same memory, for vectorized search
+        self.wpos = 0    # end of valid data
+        self.scan = 0    # where the next marker search starts
+        self.soi = -1    # start of the current frame, -1 if not found yet
+
+    def feed(self, chunk):
+        """Appends chunk and yields every complete JPEG found so far, as a uint8 view into
+        the buffer (no copy). A view is only valid until the generator is resumed."""
+        n = len(chunk)
+        if self.wpos + n > len(self.buf):
+            # no EOI within a whole buffer: garbage or oversized frame, start over
+            self.wpos = self.scan = 0; self.soi = -1
+            if n > len(self.buf): return
+        self.mv[self.wpos:self.wpos + n] = chunk
+        self.wpos += n
+        while True:
+            if self.soi == -1:
+                a = find_marker(self.arr, 0xD8, self.scan, self.wpos)
+                if a == -1:
+                    # keep 1 byte back in case the marker is split between chunks
+                    self.scan = max(0, self.wpos - 1); return
+                self.soi = a; self.scan = a + 2
+            b = find_marker(self.arr, 0xD9, self.scan, self.wpos)
+            if b == -1:
+                self.scan = max(self.soi + 2, self.wpos - 1); return
+            yield self.arr[self.soi:b + 2]
+            # move the remaining tail to the front, no new allocation
+            tail = self.wpos - (b + 2)
+            self.mv[:tail] = self.mv[b + 2:self.wpos]
+            self.wpos = tail; self.scan = 0; self.soi = -1
+
 # ---------- Stream workers ----------
 class StreamWorker(threading.Thread):
     """Tries OpenCV first, falls back to manual MJPEG if it fails; retries upon disconnection."""
@@ -53,24 +190,52 @@ class StreamWorker(threading.Thread):
         self.q = frame_q
         self.stop = stop_evt
         self.log = log_fn
+        self.good_url = None  # last URL that delivered a stream
+        # JPEG decode runs here so the socket keeps being read meanwhile (cv2 releases the GIL)
+        self.decode_pool = ThreadPoolExecutor(max_workers=2)
+        self.decode_slots = threading.BoundedSemaphore(4)  # max frames waiting for decode
+        # two decoders can finish out of order: frames are numbered and older ones dropped
+        self.decode_seq, self.put_seq = 0, 0
+        self.put_lock = threading.Lock()
+
+    def decode_async(self, jpg):
+        if not self.decode_slots.acquire(blocking=False):
+            return  # decoders are behind, drop this frame
+        self.decode_seq += 1
+        seq = self.decode_seq
+        fut = self.decode_pool.submit(decode_jpg, jpg)
+        fut.add_done_callback(lambda f: self.on_decoded(f, seq))
+
+    def on_decoded(self, fut, seq):
+        self.decode_slots.release()
+        try: img = fut.result()
+        except Exception: return
+        if img is None or self.stop.is_set():
+            return  # worker stopped: don't feed the next stream stale frames
+        with self.put_lock:
+            if seq <= self.put_seq: return
+            self.put_seq = seq
+            self.q.put(img)
 
     def run(self):
-        candidates = [
+        try: self.stream_loop()
+        finally: self.decode_pool.shutdown(wait=False)
+
+    def stream_loop(self):
+        candidates = list(dict.fromkeys([  # de-duplicated, order kept
             self.url,
-            self.url.replace(":81","").replace("/stream","/stream"),
+            self.url.replace(":81", ""),  # same host on port 80
             "http://192.168.4.1:81/stream",
             "http://192.168.4.1/stream",
-        ]
-        tried = set()
+        ]))
+        i = 0
         while not self.stop.is_set():
-            # next candidate URL
-            url = None
-            for c in candidates:
-                if c not in tried:
-                    url = c; break
+            # the URL that last gave a stream first, otherwise the next candidate;
+            # it has to prove itself again to stay first
+            url = self.good_url
             if url is None:
-                tried = set(); url = candidates[0]
-            tried.add(url)
+                url = candidates[i % len(candidates)]; i += 1
+            self.good_url = None
 
             if self.stop.is_set(): break
             ok = self.try_opencv(url)
@@ -81,50 +246,87 @@ class StreamWorker(threading.Thread):
     def try_opencv(self, url):
         self.log(f"[INFO] Connecting with OpenCV: {url}")
         cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
-        start = time.time(); got_first = False
+        last_ok = time.time(); got_first = False
         while not self.stop.is_set():
-            ok, frame = cap.read()
-            if ok and frame is not None:
+            ok = cap.grab()
+            if ok:
+                last_ok = time.time()
                 if not got_first:
-                    got_first = True
+                    got_first = True; self.good_url = url
                     self.log("[OK] OpenCV stream started.")
-                try: self.q.put(frame, timeout=0.1)
-                except queue.Full: pass
+                # decode/convert only if the GUI has room for it, otherwise just advance the stream
+                if not self.q.full():
+                    ok, frame = cap.retrieve()
+                    if ok and frame is not None and not self.stop.is_set():
+                        self.q.put(frame)
                 continue
-            if not got_first and time.time() - start > 5:
-                self.log("[WARN] OpenCV could not get the first frame, switching to manual MJPEG.")
+            if time.time() - last_ok > 5:
                 cap.release()
-                return False
+                if not got_first:
+                    self.log("[WARN] OpenCV could not get the first frame, switching to manual MJPEG.")
+                    return False
+                self.log("[WARN] OpenCV stream lost, reconnecting.")
+                return True
             time.sleep(0.02)
         cap.release()
         return True
 
     def try_manual_mjpeg(self, url):
-        while not self.stop.is_set():
-            try:
-                self.log(f"[INFO] Manual MJPEG: {url}")
-                # timeout=(connect, read) -> giving long read time
-                r = requests.get(url, stream=True, timeout=(5, 60))
+        """One connection; returns when it fails or the stream ends, stream_loop picks the next URL."""
+        try:
+            self.log(f"[INFO] Manual MJPEG: {url}")
+            # timeout=(connect, read) -> giving long read time
+            # `with` closes the socket on errors too: the camera serves one stream client at a time
+            with STREAM_SESSION.get(url, stream=True, timeout=(5, 60)) as r:
                 r.raise_for_status()
+                self.good_url = url
                 self.log("[OK] Manual MJPEG stream started.")
-                buf = bytearray()
-                for chunk in r.iter_content(chunk_size=2048):
-                    if self.stop.is_set(): break
-                    if not chunk: continue
-                    buf += chunk
-                    a = buf.find(b'\xff\xd8'); b = buf.find(b'\xff\xd9')
-                    if a != -1 and b != -1 and b > a:
-                        jpg = buf[a:b+2]; buf = buf[b+2:]
-                        img = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), 1)
-                        if img is not None:
-                            try: self.q.put(img, timeout=0.1)
-                            except queue.Full: pass
-                # if loop ends, connection is lost, retry
-            except Exception as e:
-                self.log(f"[ERR] MJPEG error: {e}; retrying in 3 sec…")
-                time.sleep(3)
-            finally:
-                if self.stop.is_set(): break
+                # the http.client response under urllib3: its readline/read1 return as soon as
+                # data is there (urllib3's own read waits until the requested size is filled)
+                src = r.raw._fp
+                ctype = r.headers.get("Content-Type", "")
+                if "boundary=" in ctype:
+                    boundary = ctype.split("boundary=", 1)[1].split(";")[0].strip().strip('"')
+                    self.read_parts(src, boundary.lstrip("-").encode())
+                else:
+                    self.read_markers(src)
+            if not self.stop.is_set():
+                self.log("[WARN] MJPEG stream lost, reconnecting.")
+        except Exception as e:
+            self.log(f"[ERR] MJPEG error: {e}; retrying in 3 sec…")
+            self.stop.wait(3)
+
+    def read_parts(self, src, boundary):
+        """multipart/x-mixed-replace: read each part's Content-Length bytes, no marker scanning."""
+        while not self.stop.is_set():
+            length, in_part = None, False
+            while True:
+                line = src.readline(1024)
+                if not line: return
+                if line.rstrip().lstrip(b"-") == boundary:
+                    in_part = True
+                elif line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+                elif in_part and not line.strip():
+                    break  # end of part headers
+            if length is None:
+                self.log("[WARN] MJPEG part without Content-Length, scanning for JPEG markers.")
+                return self.read_markers(src)
+            jpg = src.read(length)
+            if len(jpg) < length: return
+            self.decode_async(jpg)
+
+    def read_markers(self, src):
+        """Any MJPEG byte stream: cut frames at the JPEG SOI/EOI markers."""
+        demux = MjpegBuffer()
+        while not self.stop.is_set():
+            chunk = src.read1(MJPEG_READ_SIZE)
+            if not chunk: return
+            for jpg in demux.feed(chunk):
+                # decoded right here: the view is overwritten once the buffer is compacted
+                img = decode_jpg(jpg)
+                if img is not None and not self.stop.is_set():
+                    self.q.put(img)
 
 class CaptureWorker(threading.Thread):
     """Safe Mode: 2–3 FPS image with /capture."""
@@ -141,15 +343,69 @@ class CaptureWorker(threading.Thread):
             try:
                 data = capture_jpg(timeout=(5,10))
                 if data:
-                    img = cv2.imdecode(np.frombuffer(data, np.uint8), 1)
-                    if img is not None:
-                        try: self.q.put(img, timeout=0.1)
-                        except queue.Full: pass
+                    img = decode_jpg(data)
+                    if img is not None and not self.stop.is_set():
+                        self.q.put(img)
             except Exception as e:
                 self.log(f"[ERR] Safe Mode capture: {e}")
             time.sleep(self.interval)
 
+class RecordWorker(threading.Thread):
+    """Writes frames to an mp4 file off the GUI thread; drops the oldest frame if the encoder falls behind."""
+    def __init__(self, path, log_fn, fps=20.0):
+        super().__init__(daemon=True)
+        self.path = path
+        self.log = log_fn
+        self.fps = fps
+        self.q = queue.Queue(maxsize=30)
+
+    def put(self, frame):
+        while True:
+            try: self.q.put_nowait(frame); return
+            except queue.Full: pass
+            try: self.q.get_nowait()
+            except queue.Empty: pass
+
+    def stop(self):
+        self.put(None)
+        self.join(timeout=5.0)
+
+    def open_writer(self, size):
+        """H.264 through FFMPEG (hardware encoder if OpenCV finds one), else mp4v."""
+        params = []
+        if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):  # OpenCV >= 4.5.2
+            params = [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        for codec in ("avc1", "mp4v"):
+            fourcc = cv2.VideoWriter_fourcc(*codec)
+            if params:
+                rec = cv2.VideoWriter(self.path, cv2.CAP_FFMPEG, fourcc, self.fps, size, params)
+            else:
+                rec = cv2.VideoWriter(self.path, cv2.CAP_FFMPEG, fourcc, self.fps, size)
+            if rec.isOpened():
+                self.log(f"[REC] Encoder: {codec}")
+                return rec
+            rec.release()
+        # no FFMPEG backend, let OpenCV pick one
+        return cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*"mp4v"), self.fps, size)
+
+    def run(self):
+        rec = None  # we will open the size at the first frame
+        while True:
+            frame = self.q.get()
+            if frame is None: break
+            try:
+                if rec is None:
+                    h, w = frame.shape[:2]
+                    rec = self.open_writer((w, h))
+                rec.write(frame)
+            except Exception as e:
+                self.log(f"[ERR] Recording: {e}")
+        if rec is not None:
+            rec.release()
+
 # ---------- GUI ----------
+OSD_W, OSD_H = 200, 32  # FPS text patch, drawn at (10, 2) of the display image
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -172,6 +428,8 @@ class App(tk.Tk):
 
         # Image area
         self.video = tk.Label(self, bg="black"); self.video.pack(fill="both", expand=True, padx=8, pady=8)
+        self.vid_w, self.vid_h = 960, 540  # kept up to date by <Configure>, no per-frame winfo calls
+        self.video.bind("<Configure>", self.on_video_resize)
 
         # Controls
         ctl = tk.Frame(self, bg="#303030"); ctl.pack(fill="x", padx=8, pady=4)
@@ -185,6 +443,7 @@ class App(tk.Tk):
 
         tk.Label(ctl, text="  Quality:", fg="white", bg="#303030").pack(side="left", padx=(12,3))
         self.q_label = tk.Label(ctl, text="35", fg="white", bg="#303030"); self.q_label.pack(side="right")
+        self.pending_quality, self.quality_after = 35, None
         self.q_scale = tk.Scale(ctl, from_=10, to=55, orient="horizontal",
                                 showvalue=False, command=self.on_quality_change,
                                 length=280, bg="#303030", fg="white",
@@ -196,14 +455,19 @@ class App(tk.Tk):
         self.log("[INFO] Ready. Click 'Start' first.")
 
         # State
-        self.frame_q = queue.Queue(maxsize=5)
+        self.frame_q = FrameRing(4)
         self.stop_evt = threading.Event()
         self.worker = None
         self.fps_cnt, self.fps, self.last_t = 0, 0.0, time.time()
         self.recording, self.rec, self.rec_path = False, None, None
+        self.tk_img, self.tk_img_size = None, None
+        self.last_frame = None
+        self.osd_cache = None  # (text, patch, mask)
 
-        # UI loop
-        self.after(15, self.update_frame)
+        # UI loop: workers never call into Tk, the GUI checks the ring itself
+        self.after(10, self.poll_frames)
+        if sys.platform == "darwin":
+            self.after(500, self.macos_nudge)
 
     # ---- Log helper ----
     def log(self, msg):
@@ -218,21 +482,24 @@ class App(tk.Tk):
     def start_stream(self):
         self.stop_stream()
         url = self.url_var.get().strip()
-        self.stop_evt.clear()
+        # a fresh Event per worker: the previous one may still be finishing a read,
+        # and must keep seeing its own stop flag
+        self.stop_evt = threading.Event()
         self.worker = StreamWorker(url, self.frame_q, self.stop_evt, self.log)
         self.worker.start()
         self.log(f"[INFO] Connecting: {url}")
 
     def start_safe(self):
         self.stop_stream()
-        self.stop_evt.clear()
+        self.stop_evt = threading.Event()
         self.worker = CaptureWorker(self.frame_q, self.stop_evt, self.log, interval=0.4)
         self.worker.start()
 
     def stop_stream(self):
         if self.worker:
+            # no join: blocking the GUI thread on a worker stuck in a read freezes the window;
+            # the worker sees its own Event and exits by itself, without putting more frames
             self.stop_evt.set()
-            self.worker.join(timeout=1.0)
             self.worker = None
         self.log("[INFO] Stopped.")
 
@@ -245,24 +512,24 @@ class App(tk.Tk):
             self.log(f"[OK] Snapshot saved: {p}")
             return
         # Otherwise take from last frame
-        try:
-            frame = self.frame_q.get_nowait()
-            p = os.path.join(OUTPUT_DIR, f"snap_{now_ts()}.png")
-            cv2.imwrite(p, frame)
-            self.log(f"[OK] Snapshot (frame) saved: {p}")
-        except queue.Empty:
+        if self.last_frame is None:
             self.log("[WARN] No frame for snapshot.")
+            return
+        p = os.path.join(OUTPUT_DIR, f"snap_{now_ts()}.png")
+        cv2.imwrite(p, self.last_frame)
+        self.log(f"[OK] Snapshot (frame) saved: {p}")
 
     def toggle_record(self):
         if not self.recording:
             self.recording = True
             self.rec_path = os.path.join(OUTPUT_DIR, f"rec_{now_ts()}.mp4")
-            self.rec = None  # we will open the size at the first frame
+            self.rec = RecordWorker(self.rec_path, self.log)
+            self.rec.start()
             self.log(f"[REC] Recording starting: {self.rec_path}")
         else:
             self.recording = False
             if self.rec:
-                self.rec.release(); self.rec = None
+                self.rec.stop(); self.rec = None
                 self.log(f"[REC] Recording stopped: {self.rec_path}")
 
     def apply_framesize(self, code):
@@ -274,57 +541,99 @@ class App(tk.Tk):
     def on_quality_change(self, _):
         v = int(self.q_scale.get())
         self.q_label.config(text=str(v))
+        # send only after the slider has been still for a moment, not on every motion event
+        self.pending_quality = v
+        if self.quality_after:
+            self.after_cancel(self.quality_after)
+        self.quality_after = self.after(150, self.flush_quality)
+
+    def flush_quality(self):
+        self.quality_after = None
+        v = self.pending_quality
         r = set_quality(v)
         self.log(f"[INFO] quality={v} sent." if (r and r.ok) else "[ERR] quality could not be sent.")
 
     # ---- Frame drawing ----
+    def on_video_resize(self, evt):
+        self.vid_w = evt.width or 960
+        self.vid_h = evt.height or 540
+
+    def draw_osd(self, img):
+        """Blits the FPS text onto the display image; the text is only rasterized when it changes."""
+        text = f"FPS: {self.fps:4.1f}"
+        if self.osd_cache is None or self.osd_cache[0] != text:
+            patch = np.zeros((OSD_H, OSD_W, 3), np.uint8)
+            mask = np.zeros((OSD_H, OSD_W), np.uint8)
+            for color, thick in (((0, 0, 0), 3), ((255, 255, 255), 1)):
+                cv2.putText(patch, text, (0, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, thick, cv2.LINE_AA)
+            cv2.putText(mask, text, (0, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 255, 3, cv2.LINE_AA)
+            self.osd_cache = (text, patch, mask[..., None] > 0)
+        _, patch, mask = self.osd_cache
+        if img.shape[0] < OSD_H + 2 or img.shape[1] < OSD_W + 10:
+            return
+        np.copyto(img[2:2 + OSD_H, 10:10 + OSD_W], patch, where=mask)
+
+    def poll_frames(self):
+        # only two int compares when nothing arrived; draws as soon as a frame is in the ring
+        if self.frame_q.pending():
+            self.update_frame()
+        self.after(10, self.poll_frames)
+
+    def macos_nudge(self):
+        # a little nudge for macOS/Tk, twice a second instead of on every frame
+        self.update_idletasks()
+        self.after(500, self.macos_nudge)
+
     def update_frame(self):
         try:
-            frame = self.frame_q.get_nowait()  # get only 1 frame
-            # FPS/OSD
-            self.fps_cnt += 1
-            t = time.time()
-            if t - self.last_t >= 1.0:
-                self.fps = self.fps_cnt / (t - self.last_t)
-                self.fps_cnt = 0;
-                self.last_t = t
-            cv2.putText(frame, f"FPS: {self.fps:4.1f}", (10, 24),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 3, cv2.LINE_AA)
-            cv2.putText(frame, f"FPS: {self.fps:4.1f}", (10, 24),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1, cv2.LINE_AA)
-
-            # Recording
-            if self.recording:
-                h, w = frame.shape[:2]
-                if self.rec is None:
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    self.rec = cv2.VideoWriter(self.rec_path, fourcc, 20.0, (w, h))
-                self.rec.write(frame)
+            # drain the ring: every frame is counted and recorded, only the newest is drawn
+            frame = None
+            while True:
+                try: frame = self.frame_q.get_nowait()
+                except queue.Empty: break
+                # FPS/OSD
+                self.fps_cnt += 1
+                t = time.time()
+                if t - self.last_t >= 1.0:
+                    self.fps = self.fps_cnt / (t - self.last_t)
+                    self.fps_cnt = 0;
+                    self.last_t = t
+
+                # Recording (no copy: the draw path below never writes into frame)
+                if self.recording:
+                    self.rec.put(frame)
+            if frame is None:
+                raise queue.Empty
+            self.last_frame = frame  # full-size, for snapshot
 
             # Draw to TK
+            W, H = self.vid_w, self.vid_h
+            # shrink to fit (keeping aspect) before the color conversion, so it runs on fewer pixels
+            h, w = frame.shape[:2]
+            scale = min(W / w, H / h)
+            if scale < 1:
+                frame = cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))),
+                                   interpolation=cv2.INTER_AREA)
             rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self.draw_osd(rgb)
             im = Image.fromarray(rgb)
-            W = self.video.winfo_width() or 960
-            H = self.video.winfo_height() or 540
-            im.thumbnail((W, H))
-            imgtk = ImageTk.PhotoImage(im)
-            self.video.imgtk = imgtk
-            self.video.configure(image=imgtk)
-            # a little nudge for macOS/Tk
-            self.update_idletasks()
+            # reuse one Tk image, only recreate it when the drawn size changes
+            if self.tk_img is None or self.tk_img_size != im.size:
+                self.tk_img = ImageTk.PhotoImage(im)
+                self.tk_img_size = im.size
+                self.video.configure(image=self.tk_img)
+            else:
+                self.tk_img.paste(im)
 
         except queue.Empty:
             pass
         except Exception as e:
             self.log(f"[ERR] draw_frame: {e}")
 
-        # around 30–40 fps
-        self.after(25, self.update_frame)
-
     def on_close(self):
         self.stop_stream()
         if self.rec:
-            self.rec.release()
+            self.rec.stop()
         self.destroy()
 
 if __name__ == "__main__":